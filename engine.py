@@ -1,7 +1,19 @@
-import json
 import requests
-import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson as _json
+    _dumps = _json.dumps
+except ImportError:
+    import json as _json
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj).encode("utf-8")
 
 SPICE_FILE = Path("spice.json")
 THEME_FILE = Path("themes.json")
@@ -10,43 +22,90 @@ KEYS_FILE = Path("configs/keys.json")
 
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Shared session so repeated calls reuse the pooled TLS connection.
+# Only connect failures and 503 are retried on the same pool. Read
+# timeouts, 502 and 504 are never retried: the request may already be
+# generating a (paid) completion upstream.
+_OR_SESSION = requests.Session()
+_OR_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            read=False,
+            backoff_factor=0.1,
+            status_forcelist=(503,),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+)
+
 # =============================
 # Loaders
 # =============================
 
+@lru_cache(maxsize=32)
+def _load(path: Path):
+    # Parsed on first use, then fixed for the life of the process.
+    # Every load_* caller gets this same dict back: treat it as read-only
+    # (copy.deepcopy it first if you need to change anything).
+    return _json.loads(path.read_bytes())
+
+
 def load_spice_levels():
-    with open(SPICE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load(SPICE_FILE)
 
 
 def load_themes():
-    with open(THEME_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load(THEME_FILE)
 
 
 def clamp_level(level: int) -> int:
-    return max(1, min(level, 10))
+    return 1 if level < 1 else 10 if level > 10 else level
 
 
 def load_config():
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load(CONFIG_FILE)
 
 
 def load_keys():
-    with open(KEYS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load(KEYS_FILE)
 
 
 # =============================
 # Prompt Builder
 # =============================
 
+# Constant rules block, built once instead of per prompt
+_PROMPT_HEAD = (
+    "You are MaidensAcquisistions.AI, or MA.AI, or Mai.\n"
+    "You generate sharp, punchy flirt lines for Twitch chat.\n"
+    "\n"
+    "Rules:\n"
+    "- Maximum 15-20 words total\n"
+    "- One complete sentence only (no em-dashes, no multiple clauses)\n"
+    "- Capture the vibe and atmosphere of the theme naturally\n"
+    "- No asterisks, no italics, no formatting marks\n"
+    "- Twitch-safe language only\n"
+    "- Deliver the punchline fast\n"
+    "\n"
+)
+
+
+@lru_cache(maxsize=256)
+def _canon(theme: str) -> str:
+    return theme.strip().lower()
+
+
 def build_prompt(theme: str, style: str, level: int, spice_data: dict, theme_data: dict) -> str:
     lvl = str(clamp_level(level))
     spice_desc = spice_data.get(lvl, "playful and flirty energy")
 
-    theme_key = theme.strip().lower()
+    theme_key = _canon(theme)
     anchors = theme_data.get(theme_key, [])
 
     # Build context block if anchors exist
@@ -54,31 +113,32 @@ def build_prompt(theme: str, style: str, level: int, spice_data: dict, theme_dat
     if anchors:
         context_block = f"\n\nContext for {theme_key} theme:\n{', '.join(anchors[:5])}"  # Limit to 5 for brevity
 
-    return f"""
-You are MaidensAcquisistions.AI, or MA.AI, or Mai.
-You generate sharp, punchy flirt lines for Twitch chat.
-
-Rules:
-- Maximum 15-20 words total
-- One complete sentence only (no em-dashes, no multiple clauses)
-- Capture the vibe and atmosphere of the theme naturally
-- No asterisks, no italics, no formatting marks
-- Twitch-safe language only
-- Deliver the punchline fast
-
-Style: {style}
-Theme: {theme_key}
-Energy: {spice_desc}{context_block}
-
-Output the flirt line only. No preamble, no explanation.
-""".strip()
+    return (
+        f"{_PROMPT_HEAD}"
+        f"Style: {style}\n"
+        f"Theme: {theme_key}\n"
+        f"Energy: {spice_desc}{context_block}\n\n"
+        "Output the flirt line only. No preamble, no explanation."
+    )
 
 
 # =============================
 # OpenRouter Backend
 # =============================
 
-def ask_openrouter(prompt: str) -> str:
+@lru_cache(maxsize=1)
+def _or_headers(api_key: str) -> MappingProxyType:
+    # keys.json is fixed per process, so this is built once; read-only so
+    # no caller can change the Authorization header of later requests
+    return MappingProxyType({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "http://localhost",
+        "X-Title": "FlirtDaemon"
+    })
+
+
+def _or_settings():
     config = load_config()
     keys = load_keys()
 
@@ -87,13 +147,13 @@ def ask_openrouter(prompt: str) -> str:
     max_tokens = config["max_tokens"]
     temperature = config["temperature_normal"]
     timeout = config["timeout"]
+    return api_key, model, max_tokens, temperature, timeout
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "http://localhost",
-        "X-Title": "FlirtDaemon"
-    }
+
+def ask_openrouter(prompt: str) -> str:
+    api_key, model, max_tokens, temperature, timeout = _or_settings()
+
+    headers = _or_headers(api_key)
 
     payload = {
         "model": model,
@@ -103,25 +163,33 @@ def ask_openrouter(prompt: str) -> str:
     }
 
     try:
-        r = requests.post(
+        r = _OR_SESSION.post(
             OPENROUTER_URL,
             headers=headers,
-            json=payload,
+            data=_dumps(payload),
             timeout=timeout
         )
         r.raise_for_status()
-        data = r.json()
+        data = _json.loads(r.content)
         return data["choices"][0]["message"]["content"].strip()
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         return f"WARNING: OpenRouter error: {e}"
 
 
-# =============================
-# Unified Entry Point
-# =============================
-
-def ask_model(prompt: str, backend: str = "openrouter") -> str:
-    if backend == "openrouter":
+def _ask_openrouter_safe(prompt: str) -> str:
+    # A malformed body for one prompt must not throw away the rest of the batch
+    try:
         return ask_openrouter(prompt)
-    return "WARNING: No valid backend selected."
\ No newline at end of file
+    except (KeyError, IndexError, TypeError) as e:
+        return f"WARNING: OpenRouter error: {e}"
+
+
+def ask_openrouter_many(prompts: list, max_workers: int = 8) -> list:
+    # Surface missing keys.json / config typos once, before any request
+    _or_settings()
+
+    # Calls are network-bound, so overlap them on the pooled session.
+    # Results come back in the same order as prompts.
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_ask_openrouter_safe, prompts))
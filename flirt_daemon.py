@@ -13,6 +13,8 @@ from engine import (
 
 MAX_SPICE = 10  # Updated to match new spice.json
 
+_SPLIT_RE = re.compile(r"[,\-]")
+
 
 def parse_input(text):
     """Parse user input into theme, style, level"""
@@ -23,7 +25,7 @@ def parse_input(text):
     if not text:
         return theme, style, level
 
-    parts = re.split(r"[,\-]", text)
+    parts = _SPLIT_RE.split(text)
 
     if len(parts) >= 1 and parts[0].strip():
         theme = parts[0].strip().lower()
@@ -53,11 +55,8 @@ if __name__ == "__main__":
     if is_vague_input(theme, style, level):
         # User is being vague - pick random theme instead of meta commentary
         theme, style, level = pick_random_theme(theme_data)
-        prompt = build_specific_prompt(theme, style, level, spice_data, theme_data)
-        
-    else:
-        # User gave specifics - generate directly
-        prompt = build_specific_prompt(theme, style, level, spice_data, theme_data)
+
+    prompt = build_specific_prompt(theme, style, level, spice_data, theme_data)
 
     result = ask_openrouter(prompt).strip()
 
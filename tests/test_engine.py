@@ -0,0 +1,58 @@
+import json
+import time
+import unittest
+from unittest import mock
+
+import engine
+
+
+class FakeResponse:
+    def __init__(self, body: dict):
+        self.content = json.dumps(body).encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def fake_post(url, data, **kwargs):
+    prompt = json.loads(data)["messages"][0]["content"]
+    # Earlier prompts finish last, so completion order != input order
+    time.sleep(0.05 / (int(prompt[-1]) + 1))
+    if prompt == "broken 2":
+        return FakeResponse({"error": "no choices"})
+    return FakeResponse({"choices": [{"message": {"content": f" reply to {prompt} "}}]})
+
+
+class AskOpenRouterManyTest(unittest.TestCase):
+    def setUp(self):
+        config = {"model": "test", "max_tokens": 10, "temperature_normal": 0.5, "timeout": 5}
+        keys = {"openrouter_api_key": "test-key"}
+        patches = [
+            mock.patch.object(engine, "load_config", return_value=config),
+            mock.patch.object(engine, "load_keys", return_value=keys),
+            mock.patch.object(engine._OR_SESSION, "post", side_effect=fake_post)
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_results_keep_input_order(self):
+        prompts = [f"prompt {i}" for i in range(5)]
+        results = engine.ask_openrouter_many(prompts, max_workers=5)
+        self.assertEqual(results, [f"reply to prompt {i}" for i in range(5)])
+
+    def test_failed_prompt_does_not_drop_batch(self):
+        results = engine.ask_openrouter_many(["prompt 0", "prompt 1", "broken 2", "prompt 3"])
+        self.assertEqual(results[:2], ["reply to prompt 0", "reply to prompt 1"])
+        self.assertTrue(results[2].startswith("WARNING: OpenRouter error:"))
+        self.assertEqual(results[3], "reply to prompt 3")
+
+    def test_config_errors_raise_before_any_request(self):
+        with mock.patch.object(engine, "load_keys", side_effect=FileNotFoundError("keys.json")):
+            with self.assertRaises(FileNotFoundError):
+                engine.ask_openrouter_many(["prompt 0", "prompt 1"])
+        engine._OR_SESSION.post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()